@@ -30,6 +30,8 @@ try:
 	)
 
 	# Create an instance of Device and associate it with the port...
+	#   If you know how many relays your board has, Device(port, relay_count=4)
+	#   skips the status query that would otherwise be used to count them.
 	device = Device(port)
 
 	# Open the first relay...
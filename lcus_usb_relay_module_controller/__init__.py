@@ -17,6 +17,8 @@
 
 import time
 
+_QUERY_STATUS_FRAME = bytes([0xff, 0x0d, 0xa])	# Built once, sent per query.
+
 class _ChannelArray(bytearray):
 	"""
 	Each element in the ChannelArray represents the on/off status of a relay.
@@ -24,6 +26,8 @@ class _ChannelArray(bytearray):
 
 	Setting an item in the array automatically updates the corresponding relay.
 	"""
+	__slots__ = ('_device',)
+
 	def __init__(self, device, count):
 		self._device = device
 		super().__init__(count)
@@ -34,24 +38,61 @@ class _ChannelArray(bytearray):
 			self._device._set_relay(key, value)
 		super().__setitem__(key, value)
 
+	# Update our copy of the status only, writing straight into the buffer.
+	_store = bytearray.__setitem__
+
 class Device:
 	"""
 	This class represents the USB relay board.
+
+	If relay_count is given (it must be at least 1), the initial status query
+	used to count the relays is skipped, and the channel array starts with
+	every relay closed until the next call to query_relay_status().
 	"""
-	def __init__(self, port):
+	def __init__(self, port, relay_count=None):
 		self._delay_seconds = 0.01	# Small delay introduced to fix reliability.
 		self._port = port
-		self.channel = None
-		self.query_relay_status()
+		self._commands = {}		# (key, state) -> command bytes, built on demand.
+		if relay_count is not None:
+			if relay_count < 1:
+				raise ValueError('relay_count must be at least 1')
+			self.channel = _ChannelArray(self, relay_count)
+		else:
+			self.channel = _ChannelArray(self, 0)	# Sized by the query below.
+			self.query_relay_status()
 
-	def _set_relay(self, key, value):
-		starting_id = 0xA0  		# default value is 0xA0
-		ch_number = key + 1			# channel number (base 1)
+	def _relay_command(self, key, value):
 		state = int(value > 0)		# 0 = closed, 1 = open
-		checksum = starting_id + ch_number + state % 0xFF
-		self._port.write([starting_id, ch_number, state, checksum, 0x0d, 0xa])
+		command = self._commands.get((key, state))
+		if command is None:
+			starting_id = 0xA0  		# default value is 0xA0
+			ch_number = key + 1			# channel number (base 1)
+			checksum = (starting_id + ch_number + state) & 0xFF
+			command = bytes([starting_id, ch_number, state, checksum, 0x0d, 0xa])
+			self._commands[(key, state)] = command
+		return command
+
+	def _set_relay(self, key, value):
+		self._port.write(self._relay_command(key, value))
 		time.sleep(self._delay_seconds)
 
+	def _set_all_relays(self, value):
+		relay_count = len(self.channel)
+		state = int(value > 0)
+		# The board has no documented all-channels command, so every channel
+		# still gets its own command, each followed by the usual delay.
+		for i in range(0, relay_count):
+			self._set_relay(i, state)
+		self.channel._store(slice(0, relay_count), bytes([state]) * relay_count)
+
+	def open_all(self):
+		"""Open every relay on the device."""
+		self._set_all_relays(1)
+
+	def close_all(self):
+		"""Close every relay on the device."""
+		self._set_all_relays(0)
+
 	def query_relay_status(self):
 		"""
 		Query the status of relays on the device, and update our internal
@@ -62,22 +103,38 @@ class Device:
 
 		Returns the device's native response as a list of byte arrays.
 		"""
-		self._port.write([0xff,0x0d,0xa])
-		time.sleep(self._delay_seconds)
+		self._port.reset_input_buffer()		# Drop anything left from before.
+		self._port.write(_QUERY_STATUS_FRAME)
+		# No sleep needed here: readline() blocks until a line arrives or the
+		# port's read timeout expires. Once we know how many relays there are
+		# we stop after that many lines, rather than waiting for a timeout to
+		# tell us the device has finished.
+		expected = len(self.channel) or None
 		lines = []
-		while True:
-			bytes = self._port.readline()
-			if(len(bytes) == 0):
+		while len(lines) != expected:
+			line = self._port.readline()
+			if(len(line) == 0):
 				break
-			lines.append(bytes.strip())
+			lines.append(line.strip())
 
 		relay_count = len(lines)  # We assume there's one line for every relay.
 
-		if self.channel == None:
+		# The relay count is only taken from a response that actually arrived,
+		# so a missed first reply doesn't leave us stuck with zero relays.
+		if not self.channel and relay_count > 0:
 			self.channel = _ChannelArray(self, relay_count)
 
-		for i in range(0, relay_count):
-			self.channel.__setitem__(i, lines[i].find(b'OFF') < 0, False)
+		for i, line in enumerate(lines):
+			# Lines look like b'CH1: ON' or b'CH1: OFF'. Take the channel
+			# number from the line if we can, otherwise go by position.
+			colon = line.find(b':')
+			if colon == 3 and 0x31 <= line[2] <= 0x39:
+				ch = line[2] - 0x31		# CH1..CH9, i.e. every LCUS-1/2/4/8 line.
+			else:
+				digits = line[2:colon] if colon > 3 else b''
+				ch = int(digits) - 1 if digits.isdigit() else i
+			if 0 <= ch < len(self.channel):	# Skip relays we have no slot for.
+				self.channel._store(ch, line.endswith(b'ON'))
 
 		return lines
 
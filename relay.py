@@ -1,25 +1,50 @@
 import argparse
 import json
+import os
+import re
+import struct
 import sys
 import threading
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from queue import Queue, Empty
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import serial
-import serial.tools.list_ports
 
-import tkinter as tk
-from tkinter import ttk, messagebox
+try:
+    import orjson  # optional, faster config parse/dump
+except ImportError:
+    orjson = None
 
 
 CONFIG_DIR = Path.home() / ".cp_relay_ui"
 CONFIG_PATH = CONFIG_DIR / "cp_power_gui_config.json"
 
+# Status polling backs off from STATUS_POLL_MS towards STATUS_POLL_MAX_MS
+# while nothing changes, and drops back to STATUS_POLL_MS on user action.
+STATUS_POLL_MS = 700
+STATUS_POLL_MAX_MS = 5000
 
-@dataclass
+# How often the GUI collects replies from a RelayProxy's child process.
+PROXY_DRAIN_MS = 50
+
+# How long a status query waits for a reply. An 8-channel ASCII reply is
+# about 75 ms at 9600 baud, so this only bites when the board stays silent.
+QUERY_TIMEOUT_S = 0.2
+
+# [start, channel, op, checksum]
+_FRAME = struct.Struct("BBBB")
+# Binary status replies are one 0x00/0x01 byte per channel. Any other first
+# byte means an ASCII reply, possibly behind a stray b"\r\n" or junk byte.
+_BINARY_STATES = (b"\x00", b"\x01")
+# One channel of an ASCII status reply, e.g. b"CH1:ON" or b"CH2: OFF"
+_CH_RE = re.compile(rb"CH\s*(\d+)\s*:\s*(ON|OFF)", re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
 class AppConfig:
     relay_control_port: str = "COM5"
     baudrate: int = 9600
@@ -36,12 +61,12 @@ class AppConfig:
     power_to_usb_delay_s: float = 1.0
     inter_command_delay_s: float = 0.05  # 50ms is commonly recommended
 
+    # GUI only: run serial I/O in a child process (see RelayProxy)
+    use_subprocess_io: bool = False
 
-def ensure_config_file_exists() -> None:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    if not CONFIG_PATH.exists():
-        default_cfg = AppConfig()
-        CONFIG_PATH.write_text(json.dumps(asdict(default_cfg), indent=2), encoding="utf-8")
+    def to_dict(self) -> dict:
+        # Every field is a primitive, so skip asdict()'s recursive deep copy.
+        return {name: getattr(self, name) for name in self.__slots__}
 
 
 class LcusRelayBoard:
@@ -57,7 +82,14 @@ class LcusRelayBoard:
         self.baudrate = baudrate
         self.timeout_s = timeout_s
         self._ser: Optional[serial.Serial] = None
-        self._lock = threading.Lock()  # serialize writes/reads on the port
+        self._lock = threading.Lock()  # serialize status queries (write + read)
+        # Serializes writes alone. Set-relay frames get no reply, so a toggle
+        # only needs this one and never waits behind a query's read.
+        self._write_lock = threading.Lock()
+        # Every frame an LCUS-1..8 board can be sent, built once.
+        self._frames: Dict[Tuple[int, bool], bytes] = {
+            (ch, on): self._build_frame(ch, on) for ch in range(1, 9) for on in (False, True)
+        }
 
     @property
     def is_open(self) -> bool:
@@ -75,6 +107,9 @@ class LcusRelayBoard:
             timeout=self.timeout_s,
             write_timeout=self.timeout_s,
         )
+        # Set-relay frames get no reply, so stale input only matters to
+        # query_status(), which resets again itself; drop it once here.
+        self._ser.reset_input_buffer()
 
     def close(self) -> None:
         if self._ser and self._ser.is_open:
@@ -86,176 +121,470 @@ class LcusRelayBoard:
     def _write(self, payload: bytes) -> None:
         if not self._ser or not self._ser.is_open:
             raise RuntimeError("Relay control serial port is not open.")
-        self._ser.write(payload)
+        with self._write_lock:
+            self._ser.write(payload)
 
-    def set_relay(self, channel_1_based: int, on: bool) -> None:
-        """
-        Energize (on=True) or de-energize (on=False) the relay.
-        """
+    @staticmethod
+    def _build_frame(channel_1_based: int, on: bool) -> bytes:
         channel = channel_1_based & 0xFF
         op = 0x01 if on else 0x00
         start = 0xA0
         checksum = (start + channel + op) & 0xFF
-        frame = bytes([start, channel, op, checksum])
+        return _FRAME.pack(start, channel, op, checksum)
+
+    def set_relay(self, channel_1_based: int, on: bool) -> None:
+        """
+        Energize (on=True) or de-energize (on=False) the relay.
+        """
+        frame = self._frames.get((channel_1_based, bool(on)))
+        if frame is None:
+            frame = self._build_frame(channel_1_based, on)
+        self._write(frame)
 
+    def _transact(self, payload: bytes, relay_count: int, timeout_s: float) -> bytearray:
+        """
+        Sends payload and returns the reply once it covers relay_count
+        channels (one line each if ASCII, one byte each if binary). Each read
+        returns as soon as its line or bytes arrive, and gives up after
+        timeout_s (capped at the port timeout) if the board goes quiet. The
+        port's own read timeout is put back afterwards.
+        """
         with self._lock:
-            self._ser.reset_input_buffer()
-            self._write(frame)
+            saved_timeout = self._ser.timeout
+            self._ser.timeout = min(timeout_s, self.timeout_s)
+            try:
+                self._ser.reset_input_buffer()
+                self._write(payload)
+                data = bytearray(self._ser.read(1))
+                if data[:1] in _BINARY_STATES:
+                    if relay_count > 1:
+                        data += self._ser.read(relay_count - 1)
+                elif data:
+                    # Only lines that carry a channel count towards relay_count,
+                    # so a leading b"\r\n" doesn't end the read a line early.
+                    data += self._ser.read_until(b"\n", 256)
+                    seen = len(_CH_RE.findall(data))
+                    while seen < relay_count:
+                        line = self._ser.read_until(b"\n", 256)
+                        if not line:
+                            break
+                        data += line
+                        if _CH_RE.search(line):
+                            seen += 1
+            finally:
+                self._ser.timeout = saved_timeout
+        return data
 
     def query_status(self, relay_count: int = 2) -> Dict[int, bool]:
         """
         Returns {channel_1_based: is_on}.
 
         Tolerant parsing:
-          - If response contains ASCII 'CH', parse lines like 'CH1:ON'
-          - Else interpret first N bytes as 0/1 for each channel
+          - If the first N bytes are all 0/1, take them as each channel's state
+          - Else parse ASCII lines like 'CH1:ON', wherever they start
+        Anything else parses to {} (unknown) rather than a guessed OFF.
         """
-        with self._lock:
-            self._ser.reset_input_buffer()
-            self._write(b"\xFF")
-            # Let device respond; then read whatever is available up to timeout.
-            time.sleep(0.02)
-            data = self._ser.read(256)
-
+        data = self._transact(b"\xFF", relay_count, QUERY_TIMEOUT_S)
         status: Dict[int, bool] = {}
 
         if not data:
             return status
 
-        # Heuristic: ASCII response
-        if b"CH" in data:
-            try:
-                text = data.decode("ascii", errors="ignore")
-                for line in text.splitlines():
-                    line = line.strip()
-                    # Examples described in manuals: "CH1:ON", "CH2:OFF"
-                    if line.upper().startswith("CH") and ":" in line:
-                        left, right = line.split(":", 1)
-                        ch_str = left.upper().replace("CH", "").strip()
-                        if ch_str.isdigit():
-                            ch = int(ch_str)
-                            status[ch] = right.strip().upper().startswith("ON")
-            except Exception:
-                pass
-        else:
+        states = data[:relay_count]
+        if data[:1] in _BINARY_STATES and not states.strip(b"\x00\x01"):
             # Binary response: first N bytes are channel states 0/1.
-            for i in range(min(relay_count, len(data))):
-                status[i + 1] = (data[i] == 0x01)
+            for i, state in enumerate(states):
+                status[i + 1] = state == 0x01
+        else:
+            for m in _CH_RE.finditer(data):
+                status[int(m.group(1))] = m.group(2).upper() == b"ON"
 
         return status
 
 
+def _relay_io_process(conn, port_name: str, baudrate: int, timeout_s: float) -> None:
+    """
+    Child process body for RelayProxy: owns the real LcusRelayBoard and runs
+    (call_id, method, args) requests from the pipe until told to stop, sending
+    back (call_id, ok, result). Status queries run on their own thread, so
+    relay writes don't wait behind them (see LcusRelayBoard._write_lock).
+    """
+    board = LcusRelayBoard(port_name, baudrate, timeout_s=timeout_s)
+    send_lock = threading.Lock()
+    queries: Queue = Queue()
+
+    def run(call_id: int, method: str, args: tuple) -> None:
+        try:
+            reply = (call_id, True, getattr(board, method)(*args))
+        except Exception as e:
+            reply = (call_id, False, e)
+        with send_lock:
+            try:
+                conn.send(reply)
+            except Exception:  # e.g. an exception that can't be pickled
+                conn.send((call_id, False, RuntimeError(repr(reply[2]))))
+
+    def query_loop() -> None:
+        while True:
+            request = queries.get()
+            if request is None:
+                return
+            run(*request)
+
+    threading.Thread(target=query_loop, daemon=True).start()
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+            if request[1] == "query_status":
+                queries.put(request)
+            else:
+                run(*request)
+    finally:
+        queries.put(None)
+        board.close()
+
+
+class RelayProxy:
+    """
+    Stands in for LcusRelayBoard in the GUI, with the port owned by a child
+    process. Calls are posted over a pipe and return at once, so the Tk
+    process never waits on the COM handle or on the child. Replies are
+    handled by drain_replies(), which the GUI runs from root.after().
+
+    open() starts the child and close() stops it. is_open is what the child
+    last reported, so reading it costs nothing. Status is queried with
+    post("query_status", relay_count, on_reply=...). Failed calls posted
+    without on_reply are passed to on_error, if set.
+    """
+    def __init__(self, port_name: str, baudrate: int = 9600, timeout_s: float = 1.0):
+        self.port_name = port_name
+        self.baudrate = baudrate
+        self.timeout_s = timeout_s
+        self.on_error: Optional[Callable[[Exception], None]] = None
+        self._conn = None
+        self._proc = None
+        self._is_open = False
+        self._next_id = 0
+        # call_id -> (method, on_reply) for calls the child hasn't answered yet
+        self._pending: Dict[int, Tuple[str, Optional[Callable[[bool, object], None]]]] = {}
+        self._lock = threading.Lock()  # guards the pipe's send end and _pending
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+    def post(self, method: str, *args, on_reply: Optional[Callable[[bool, object], None]] = None) -> None:
+        """
+        Sends a call to the child without waiting for it. Once it's answered,
+        drain_replies() runs on_reply(ok, result), result being the return
+        value or the exception raised.
+        """
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("Relay control serial port is not open.")
+            call_id = self._next_id
+            self._next_id += 1
+            self._pending[call_id] = (method, on_reply)
+            self._conn.send((call_id, method, args))
+
+    def drain_replies(self) -> None:
+        """
+        Handles every reply the child has sent so far, without blocking.
+        Runs callbacks on the calling thread, i.e. the Tk thread in the GUI.
+        """
+        while self._conn is not None:
+            try:
+                if not self._conn.poll():
+                    return
+                call_id, ok, result = self._conn.recv()
+            except (EOFError, OSError):
+                err = RuntimeError("Relay I/O process exited.")
+                # Fail the calls still waiting, so callers don't wait forever.
+                for _method, on_reply in self._stop_child():
+                    if on_reply is not None:
+                        on_reply(False, err)
+                if self.on_error is not None:
+                    self.on_error(err)
+                return
+            with self._lock:
+                method, on_reply = self._pending.pop(call_id, ("", None))
+            if method == "open":
+                self._is_open = ok
+            elif method == "close":
+                self._is_open = False
+            if on_reply is not None:
+                on_reply(ok, result)
+            elif not ok and self.on_error is not None:
+                self.on_error(result)
+
+    def _stop_child(self) -> list:
+        """
+        Stops the child and returns the (method, on_reply) calls it never
+        answered.
+        """
+        with self._lock:
+            proc, conn = self._proc, self._conn
+            self._proc = self._conn = None
+            dropped = list(self._pending.values())
+            self._pending.clear()
+        self._is_open = False
+        if proc is None:
+            return dropped
+        try:
+            conn.send(None)
+        except (OSError, ValueError):
+            pass
+        # Bounded wait, so the port is free before a new child opens it.
+        proc.join(timeout=2.0)
+        if proc.is_alive():
+            proc.terminate()
+        conn.close()
+        return dropped
+
+    def open(self) -> None:
+        """
+        Starts the child if needed and asks it to open the port; is_open
+        turns True once it reports back.
+        """
+        if self._proc is None:
+            import multiprocessing as mp
+
+            conn, child_conn = mp.Pipe()
+            proc = mp.Process(
+                target=_relay_io_process,
+                args=(child_conn, self.port_name, self.baudrate, self.timeout_s),
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            with self._lock:
+                self._conn, self._proc = conn, proc
+        self.post("open")
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        try:
+            self.post("close")
+        except (OSError, ValueError):
+            pass  # child already gone
+        self._stop_child()
+
+    def set_relay(self, channel_1_based: int, on: bool,
+                  on_reply: Optional[Callable[[bool, object], None]] = None) -> None:
+        self.post("set_relay", channel_1_based, on, on_reply=on_reply)
+
+
+# (time.monotonic(), port names) from the last scan_serial_ports() call
+_PORTS_CACHE: Optional[Tuple[float, List[str]]] = None
+PORTS_CACHE_TTL_S = 5.0
+
+
+def scan_serial_ports() -> List[str]:
+    global _PORTS_CACHE
+    import serial.tools.list_ports
+
+    names = [p.device for p in serial.tools.list_ports.comports()]
+    _PORTS_CACHE = (time.monotonic(), names)
+    return names
+
+
+def make_gui_board(cfg: AppConfig):
+    """
+    Returns the board the GUI talks to: a RelayProxy if cfg.use_subprocess_io
+    is set, else a plain LcusRelayBoard.
+    """
+    board_cls = RelayProxy if cfg.use_subprocess_io else LcusRelayBoard
+    return board_cls(cfg.relay_control_port, cfg.baudrate, timeout_s=1.0)
+
+
 class ControlPanelSequencer:
     def __init__(self, board: LcusRelayBoard, cfg: AppConfig):
         self.board = board
         self.cfg = cfg
         self._seq_lock = threading.Lock()
-
-    def _logical_to_physical(self, logical_on: bool, invert: bool) -> bool:
-        # If invert=True, relay "ON" means logical "OFF" (NC wiring, etc.)
-        return logical_on ^ invert
-
-    def set_power(self, on: bool) -> None:
-        self.board.set_relay(
-            self.cfg.power_relay_channel,
-            self._logical_to_physical(on, self.cfg.invert_power),
-        )
-
-    def set_usb(self, on: bool) -> None:
-        self.board.set_relay(
-            self.cfg.usb_relay_channel,
-            self._logical_to_physical(on, self.cfg.invert_usb),
-        )
+        # cfg is frozen, so the mapping can be copied out once. If invert is
+        # set, relay "ON" means logical "OFF" (NC wiring, etc.): phys = on ^ inv.
+        self._power_ch = cfg.power_relay_channel
+        self._usb_ch = cfg.usb_relay_channel
+        self._power_inv = cfg.invert_power
+        self._usb_inv = cfg.invert_usb
+        # enough channels for a status query to cover both mapped relays
+        self.status_relay_count = max(self._power_ch, self._usb_ch)
+
+    # **opts go to board.set_relay, e.g. RelayProxy's on_reply.
+    def set_power(self, on: bool, **opts) -> None:
+        self.board.set_relay(self._power_ch, on ^ self._power_inv, **opts)
+
+    def set_usb(self, on: bool, **opts) -> None:
+        self.board.set_relay(self._usb_ch, on ^ self._usb_inv, **opts)
+
+    def sequence_steps(self, which: str) -> List[Tuple[float, Callable[[], None]]]:
+        """
+        Returns the "on", "off" or "reset" sequence as (delay_before_s, action)
+        steps, so the GUI can schedule them with after() instead of sleeping.
+        """
+        inter = self.cfg.inter_command_delay_s
+        if which == "on":
+            return [
+                (0.0, partial(self.set_usb, False)),
+                (inter, partial(self.set_power, True)),
+                (self.cfg.power_to_usb_delay_s, partial(self.set_usb, True)),
+            ]
+        if which == "off":
+            return [
+                (0.0, partial(self.set_power, False)),
+                (inter, partial(self.set_usb, False)),
+            ]
+        if which == "reset":
+            return [
+                (0.0, partial(self.set_power, False)),
+                (inter, partial(self.set_usb, False)),
+                (inter, partial(self.set_power, True)),
+                (self.cfg.power_to_usb_delay_s, partial(self.set_usb, True)),
+            ]
+        raise ValueError(f"Unknown sequence {which!r}")
+
+    def run_sequence(self, which: str) -> None:
+        """
+        Runs a sequence to completion, sleeping between steps.
+        """
+        with self._seq_lock:
+            for delay_s, action in self.sequence_steps(which):
+                if delay_s:
+                    time.sleep(delay_s)
+                action()
 
     def sequence_on(self) -> None:
-        with self._seq_lock:
-            self.set_usb(False)
-            time.sleep(self.cfg.inter_command_delay_s)
-            self.set_power(True)
-            time.sleep(self.cfg.power_to_usb_delay_s)
-            self.set_usb(True)
+        self.run_sequence("on")
 
     def sequence_off(self) -> None:
-        with self._seq_lock:
-            self.set_power(False)
-            time.sleep(self.cfg.inter_command_delay_s)
-            self.set_usb(False)
+        self.run_sequence("off")
 
     def sequence_reset(self) -> None:
-        with self._seq_lock:
-            self.set_power(False)
-            time.sleep(self.cfg.inter_command_delay_s)
-            self.set_usb(False)
-            time.sleep(self.cfg.inter_command_delay_s)
-            self.set_power(True)
-            time.sleep(self.cfg.power_to_usb_delay_s)
-            self.set_usb(True)
+        self.run_sequence("reset")
 
     def read_logical_status(self) -> Tuple[Optional[bool], Optional[bool]]:
         """
         Returns (power_on, usb_on) as logical states, if readable.
         """
-        raw = self.board.query_status(relay_count=2)
+        return self.logical_status(self.board.query_status(relay_count=self.status_relay_count))
+
+    def logical_status(self, raw: Dict[int, bool]) -> Tuple[Optional[bool], Optional[bool]]:
+        """
+        Maps a query_status() result to (power_on, usb_on) logical states.
+        """
         if not raw:
             return (None, None)
 
-        def phys_to_logical(phys: bool, inv: bool) -> bool:
-            return phys ^ inv
-
-        power_phys = raw.get(self.cfg.power_relay_channel)
-        usb_phys = raw.get(self.cfg.usb_relay_channel)
+        power_phys = raw.get(self._power_ch)
+        usb_phys = raw.get(self._usb_ch)
 
-        power_log = None if power_phys is None else phys_to_logical(power_phys, self.cfg.invert_power)
-        usb_log = None if usb_phys is None else phys_to_logical(usb_phys, self.cfg.invert_usb)
+        power_log = None if power_phys is None else power_phys ^ self._power_inv
+        usb_log = None if usb_phys is None else usb_phys ^ self._usb_inv
         return (power_log, usb_log)
 
 
+def _loads_config(raw: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_config(data: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+# (st_mtime_ns, config) for the last config file parsed or written, so
+# unchanged files aren't re-read and re-parsed.
+_CFG_CACHE: Optional[Tuple[int, AppConfig]] = None
+
+
 def load_config() -> AppConfig:
-    ensure_config_file_exists()
-    if CONFIG_PATH.exists():
-        try:
-            data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-            return AppConfig(**data)
-        except Exception:
-            pass
+    global _CFG_CACHE
+    try:
+        with open(CONFIG_PATH, "rb") as f:
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            if _CFG_CACHE is not None and _CFG_CACHE[0] == mtime_ns:
+                return _CFG_CACHE[1]
+            cfg = AppConfig(**_loads_config(f.read()))
+        _CFG_CACHE = (mtime_ns, cfg)
+        return cfg
+    except Exception:
+        pass
+    # Missing or unreadable: (re)write the defaults.
     default_cfg = AppConfig()
     save_config(default_cfg)
     return default_cfg
 
 
 def save_config(cfg: AppConfig) -> None:
+    global _CFG_CACHE
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    CONFIG_PATH.write_text(json.dumps(asdict(cfg), indent=2), encoding="utf-8")
+    CONFIG_PATH.write_bytes(_dumps_config(cfg.to_dict()))
+    _CFG_CACHE = (CONFIG_PATH.stat().st_mtime_ns, cfg)
 
 
-class App(tk.Tk):
+class App:
+    """
+    The GUI. Owns its Tk root rather than subclassing tk.Tk, so tkinter is only
+    imported when the GUI is actually started, not for headless runs.
+    """
     def __init__(self):
-        super().__init__()
-        self.title("CP Power Sequencer (LCUS-2)")
+        import tkinter as tk
+
+        self.root = tk.Tk()
+        self.root.title("CP Power Sequencer (LCUS-2)")
         icon = tk.PhotoImage(file="reviews_4142441.png")  # PNG
-        self.iconphoto(True, icon)            # True => apply to all future toplevels too
+        self.root.iconphoto(True, icon)       # True => apply to all future toplevels too
 
         self.cfg = load_config()
-        self.board = LcusRelayBoard(self.cfg.relay_control_port, self.cfg.baudrate, timeout_s=1.0)
+        self.board = make_gui_board(self.cfg)
         self.seq = ControlPanelSequencer(self.board, self.cfg)
 
         self.worker_q: Queue = Queue()
         self.last_error: Optional[str] = None
 
+        # Blocking board work runs on one long-lived worker thread; see
+        # _worker_loop.
+        self._cmd_q: Queue = Queue()
+        threading.Thread(target=self._worker_loop, daemon=True).start()
+
+        self._last_status: Tuple[Optional[bool], Optional[bool]] = (None, None)
+        self._idle_ticks = 0
+        self._status_after_id: Optional[str] = None
+        # RelayProxy only: a status query has been posted but not answered
+        self._status_pending = False
+        self._drain_after_id: Optional[str] = None
+
         self._build_ui()
         self._connect_board()
 
         # periodic status refresh
-        self.after(500, self._tick_status)
-        self.after(100, self._tick_worker_queue)
+        self._status_after_id = self.root.after(500, self._tick_status)
+        # worker threads report back through this event, see _post_worker_msg
+        self.root.bind("<<WorkerDone>>", self._drain_worker_queue)
+
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
-        self.protocol("WM_DELETE_WINDOW", self._on_close)
+    def mainloop(self):
+        self.root.mainloop()
 
     def _build_ui(self):
-        main = ttk.Frame(self, padding=12)
+        import tkinter as tk
+        from tkinter import ttk
+
+        main = ttk.Frame(self.root, padding=12)
         main.grid(row=0, column=0, sticky="nsew")
-        self.columnconfigure(0, weight=1)
-        self.rowconfigure(0, weight=1)
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
 
         btns = ttk.Frame(main)
         btns.grid(row=0, column=0, sticky="ew")
@@ -313,12 +642,42 @@ class App(tk.Tk):
 
     def _connect_board(self):
         self.var_port.set(self.cfg.relay_control_port)
+        self._status_pending = False
+        if isinstance(self.board, RelayProxy):
+            self.board.on_error = self._on_proxy_error
+            if self._drain_after_id is None:
+                self._drain_after_id = self.root.after(PROXY_DRAIN_MS, self._drain_proxy)
         try:
             self.board.open()
             self.last_error = None
         except Exception as e:
             self.last_error = repr(e)
 
+    def _drain_proxy(self):
+        """
+        Collects RelayProxy replies every PROXY_DRAIN_MS while one is in use.
+        """
+        self._drain_after_id = None
+        if not isinstance(self.board, RelayProxy):
+            return
+        self.board.drain_replies()
+        self._drain_after_id = self.root.after(PROXY_DRAIN_MS, self._drain_proxy)
+
+    def _on_proxy_error(self, e: Exception):
+        self.last_error = repr(e)
+        if not self.board.is_open:
+            # The child is gone, and any query it had in flight with it.
+            self._status_pending = False
+
+    def _on_proxy_status(self, ok: bool, result):
+        self._status_pending = False
+        power, usb = (None, None)
+        if ok:
+            power, usb = self.seq.logical_status(result)
+        else:
+            self.last_error = repr(result)
+        self._show_status(power, usb)
+
     def _set_buttons_enabled(self, enabled: bool):
         state = "normal" if enabled else "disabled"
         for b in (
@@ -335,90 +694,212 @@ class App(tk.Tk):
             b.config(state=state)
 
     def _run_sequence(self, which: str):
-        def worker():
+        self._set_buttons_enabled(False)
+        self._reset_status_poll()
+        if self.board.is_open:
+            self._start_sequence(which)
+            return
+
+        # Opening the port can block, so do it off the Tk thread; the
+        # sequence itself starts once the worker reports it's open.
+        def job():
+            self.board.open()
+            return ("opened", which)
+
+        self._cmd_q.put(job)
+
+    def _start_sequence(self, which: str):
+        try:
+            steps = self.seq.sequence_steps(which)
+        except ValueError as e:
+            self._handle_worker_msg(("err", repr(e)))
+            return
+        self._run_steps(which, steps)
+
+    def _run_steps(self, which: str, steps: List[Tuple[float, Callable[[], None]]]):
+        """
+        Runs the first step after its delay, then schedules the rest.
+        Buttons stay disabled until the last step has run (or one fails).
+        """
+        if not steps:
+            self._handle_worker_msg(("ok", which))
+            return
+        delay_s, action = steps[0]
+
+        def done(ok: bool = True, result=None):
+            if not ok:
+                self._handle_worker_msg(("err", repr(result)))
+                return
+            self._run_steps(which, steps[1:])
+
+        def fire():
             try:
-                if not self.board.is_open:
-                    self.board.open()
-
-                if which == "on":
-                    self.seq.sequence_on()
-                elif which == "off":
-                    self.seq.sequence_off()
-                elif which == "reset":
-                    self.seq.sequence_reset()
-                else:
-                    raise ValueError(f"Unknown sequence {which!r}")
-
-                self.worker_q.put(("ok", which))
+                if isinstance(self.board, RelayProxy):
+                    # RelayProxy returns before the relay is set, so go on
+                    # (or stop) from the child's reply, as a plain board
+                    # does by returning (or raising).
+                    action(on_reply=done)
+                    return
+                action()
             except Exception as e:
-                self.worker_q.put(("err", repr(e)))
+                self._handle_worker_msg(("err", repr(e)))
+                return
+            done()
 
-        self._set_buttons_enabled(False)
-        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(int(delay_s * 1000), fire)
 
     def _run_direct_action(self, target: str, on: bool):
-        def worker():
-            try:
-                if not self.board.is_open:
-                    self.board.open()
+        def job():
+            if not self.board.is_open:
+                self.board.open()
+
+            if target == "power":
+                setter = self.seq.set_power
+            elif target == "usb":
+                setter = self.seq.set_usb
+            else:
+                raise ValueError(f"Unknown direct action target {target!r}")
 
-                if target == "power":
-                    self.seq.set_power(on)
-                elif target == "usb":
-                    self.seq.set_usb(on)
-                else:
-                    raise ValueError(f"Unknown direct action target {target!r}")
+            detail = f"{target}_{'on' if on else 'off'}"
+            if isinstance(self.board, RelayProxy):
+                # Report from the child's reply (on the Tk thread), not
+                # before the relay has actually been set.
+                def on_reply(ok: bool, result):
+                    self._handle_worker_msg(("ok", detail) if ok else ("err", repr(result)))
 
-                self.worker_q.put(("ok", f"{target}_{'on' if on else 'off'}"))
-            except Exception as e:
-                self.worker_q.put(("err", repr(e)))
+                setter(on, on_reply=on_reply)
+                return None
+            setter(on)
+            return ("ok", detail)
 
         self._set_buttons_enabled(False)
-        threading.Thread(target=worker, daemon=True).start()
+        self._reset_status_poll()
+        self._cmd_q.put(job)
+
+    def _worker_loop(self):
+        """
+        Runs jobs from _cmd_q one at a time for the life of the app, posting
+        each job's ("ok"/"opened", detail) result, or ("err", repr(e)). A job
+        that returns None reports back itself.
+        """
+        while True:
+            job = self._cmd_q.get()
+            try:
+                msg = job()
+            except Exception as e:
+                msg = ("err", repr(e))
+            if msg is not None:
+                self._post_worker_msg(msg)
+
+    def _handle_worker_msg(self, msg: Tuple[str, str]):
+        kind = msg[0]
+        if kind == "opened":
+            self._start_sequence(msg[1])
+            return
+        if kind == "err":
+            self.last_error = msg[1]
+        else:
+            self.last_error = None
+        self._set_buttons_enabled(True)
+        self._reset_status_poll()
+
+    def _post_worker_msg(self, msg: Tuple[str, str]):
+        """
+        Called from worker threads: queues msg and wakes the Tk thread to
+        handle it, instead of the Tk thread polling the queue.
+        """
+        from tkinter import TclError
 
-    def _tick_worker_queue(self):
+        self.worker_q.put(msg)
         try:
-            msg = self.worker_q.get_nowait()
-            kind = msg[0]
-            if kind == "err":
-                self.last_error = msg[1]
-            else:
-                self.last_error = None
-        except Empty:
-            pass
-        finally:
-            self._set_buttons_enabled(True)
-            self.after(100, self._tick_worker_queue)
+            self.root.event_generate("<<WorkerDone>>", when="tail")
+        except (TclError, RuntimeError):
+            pass  # window already closed
+
+    def _drain_worker_queue(self, _event=None):
+        while True:
+            try:
+                msg = self.worker_q.get_nowait()
+            except Empty:
+                return
+            self._handle_worker_msg(msg)
 
     def _tick_status(self):
+        self._status_after_id = None
         self.var_port_open.set("OPEN" if self.board.is_open else "CLOSED")
         if self.last_error:
             self.var_error.set(self.last_error)
         else:
             self.var_error.set("-")
 
+        if not self.board.is_open:
+            # Nothing can be in flight on a closed port; a stale flag would
+            # stop queries for good once it reopens.
+            self._status_pending = False
+        elif isinstance(self.board, RelayProxy):
+            # The reply comes back through _on_proxy_status, which shows it
+            # and schedules the next tick; this one only fires if it never does.
+            if not self._status_pending:
+                try:
+                    self.board.post(
+                        "query_status", self.seq.status_relay_count,
+                        on_reply=self._on_proxy_status,
+                    )
+                    self._status_pending = True
+                except Exception as e:
+                    self.last_error = repr(e)
+            self._status_after_id = self.root.after(STATUS_POLL_MAX_MS, self._tick_status)
+            return
+
         power, usb = (None, None)
         if self.board.is_open:
             try:
                 power, usb = self.seq.read_logical_status()
             except Exception as e:
                 self.last_error = repr(e)
+        self._show_status(power, usb)
 
+    def _show_status(self, power: Optional[bool], usb: Optional[bool]):
+        """
+        Shows (power, usb) and schedules the next status tick, backing off
+        while nothing changes.
+        """
         self.var_power.set("UNKNOWN" if power is None else ("ON" if power else "OFF"))
         self.var_usb.set("UNKNOWN" if usb is None else ("ON" if usb else "OFF"))
 
-        self.after(700, self._tick_status)
+        if (power, usb) == self._last_status:
+            self._idle_ticks += 1
+        else:
+            self._idle_ticks = 0
+        self._last_status = (power, usb)
+        delay_ms = min(STATUS_POLL_MAX_MS, STATUS_POLL_MS * (1 << min(self._idle_ticks, 3)))
+        if self._status_after_id is not None:
+            self.root.after_cancel(self._status_after_id)
+        self._status_after_id = self.root.after(delay_ms, self._tick_status)
+
+    def _reset_status_poll(self):
+        """
+        Goes back to the fast status cadence, e.g. around a user action.
+        """
+        self._idle_ticks = 0
+        if self._status_after_id is not None:
+            self.root.after_cancel(self._status_after_id)
+        self._status_after_id = self.root.after(STATUS_POLL_MS, self._tick_status)
 
     def _open_config_dialog(self):
-        dlg = tk.Toplevel(self)
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+
+        dlg = tk.Toplevel(self.root)
         dlg.title("Configuration")
-        dlg.transient(self)
+        dlg.transient(self.root)
         dlg.grab_set()
 
         frame = ttk.Frame(dlg, padding=12)
         frame.grid(row=0, column=0, sticky="nsew")
 
-        ports = [p.device for p in serial.tools.list_ports.comports()]
+        cached = _PORTS_CACHE
+        ports = cached[1] if cached is not None else []
         port_var = tk.StringVar(value=self.cfg.relay_control_port)
 
         pwr_var = tk.IntVar(value=self.cfg.power_relay_channel)
@@ -433,6 +914,22 @@ class App(tk.Tk):
         port_box = ttk.Combobox(frame, textvariable=port_var, values=ports, width=18)
         port_box.grid(row=0, column=1, sticky="w")
 
+        # Enumerating ports can take hundreds of ms on Windows, so show the
+        # cached list straight away and refresh it in the background if stale.
+        if cached is None or time.monotonic() - cached[0] > PORTS_CACHE_TTL_S:
+            def show_ports(names: List[str]):
+                if port_box.winfo_exists():
+                    port_box.configure(values=names)
+
+            def refresh():
+                names = scan_serial_ports()
+                try:
+                    self.root.after(0, show_ports, names)
+                except (tk.TclError, RuntimeError):
+                    pass  # window already closed
+
+            threading.Thread(target=refresh, daemon=True).start()
+
         ttk.Label(frame, text="Power relay channel (1..8):").grid(row=1, column=0, sticky="w", pady=(8, 0))
         ttk.Spinbox(frame, from_=1, to=8, textvariable=pwr_var, width=5).grid(row=1, column=1, sticky="w", pady=(8, 0))
 
@@ -459,17 +956,29 @@ class App(tk.Tk):
                     invert_usb=bool(inv_usb.get()),
                     power_to_usb_delay_s=float(delay_var.get()),
                     inter_command_delay_s=self.cfg.inter_command_delay_s,
+                    use_subprocess_io=self.cfg.use_subprocess_io,
                 )
                 save_config(new_cfg)
+                port_changed = (
+                    new_cfg.relay_control_port != self.cfg.relay_control_port
+                    or new_cfg.baudrate != self.cfg.baudrate
+                )
                 self.cfg = new_cfg
 
+                if not port_changed and self.board.is_open:
+                    # Only the channel mapping/inversion/delays changed; keep
+                    # the open port rather than dropping and reopening it.
+                    self.seq = ControlPanelSequencer(self.board, self.cfg)
+                    dlg.destroy()
+                    return
+
                 # Rebuild controller objects
                 try:
                     self.board.close()
                 except Exception:
                     pass
 
-                self.board = LcusRelayBoard(self.cfg.relay_control_port, self.cfg.baudrate, timeout_s=1.0)
+                self.board = make_gui_board(self.cfg)
                 self.seq = ControlPanelSequencer(self.board, self.cfg)
                 self._connect_board()
 
@@ -481,6 +990,8 @@ class App(tk.Tk):
         ttk.Button(btn_row, text="Save", command=on_save).grid(row=0, column=1)
 
     def _show_help(self):
+        from tkinter import messagebox
+
         message = (
             "CP Power Sequencer Help\n\n"
             "GUI actions:\n"
@@ -500,14 +1011,14 @@ class App(tk.Tk):
             "- python relay.py --serial ON\n"
             "- python relay.py --serial OFF"
         )
-        messagebox.showinfo("Help", message, parent=self)
+        messagebox.showinfo("Help", message, parent=self.root)
 
     def _on_close(self):
         try:
             self.board.close()
         except Exception:
             pass
-        self.destroy()
+        self.root.destroy()
 
 
 def parse_args() -> argparse.Namespace:
@@ -577,8 +1088,28 @@ def run_headless_actions(args: argparse.Namespace) -> int:
             pass
 
 
+def enable_fine_timer_resolution() -> None:
+    """
+    On Windows, request 1 ms timer resolution for the life of the process, so
+    sequence delays (time.sleep headless, after() in the GUI) land close to
+    the configured values instead of rounding up to the ~15.6 ms default tick.
+    """
+    if sys.platform != "win32":
+        return
+    import atexit
+    import ctypes
+
+    try:
+        winmm = ctypes.windll.winmm
+        if winmm.timeBeginPeriod(1) == 0:  # TIMERR_NOERROR
+            atexit.register(winmm.timeEndPeriod, 1)
+    except (AttributeError, OSError):
+        pass
+
+
 def main() -> int:
     args = parse_args()
+    enable_fine_timer_resolution()
     if args.cp_action or args.power_action or args.serial_action:
         return run_headless_actions(args)
 
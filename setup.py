@@ -20,6 +20,6 @@ setup(
 		'Topic :: System :: Hardware :: Universal Serial Bus (USB)',
 		],
 	packages=['lcus_usb_relay_module_controller'],
-	install_requires=['pyserial>2']
+	install_requires=['pyserial>=3.0']
 	)
 